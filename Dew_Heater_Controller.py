@@ -14,11 +14,22 @@ Features:
       proxy, and astro chart URLs for other automation hooks.
 """
 
-import json
+# gevent must monkey-patch the stdlib before anything else imports it. It is
+# optional: without it the Werkzeug dev server is used, which spends one OS
+# thread per SSE client; with it all clients share cooperative greenlets.
+try:
+    from gevent import monkey
+
+    monkey.patch_all()
+    _HAS_GEVENT = True
+except ImportError:
+    _HAS_GEVENT = False
+
 import logging
 import mimetypes
 import os
 import re
+import socket
 import threading
 import time
 from datetime import datetime, timedelta
@@ -29,8 +40,8 @@ from urllib.parse import urljoin
 import RPi.GPIO as GPIO
 import dht11
 from flask import Flask, Response, jsonify, render_template, request, send_file, stream_with_context
-import requests
 
+from dew_heater_controller import control
 from dew_heater_controller.config import (
     ALLSKY_PUBLIC_URL,
     AMBIENT_TEMP_OFFSET_C,
@@ -41,21 +52,25 @@ from dew_heater_controller.config import (
     FORCE_RUN_TEMP_DIFF_C,
     HYSTERESIS_C,
     IMAGES_ROOT,
+    LOG_FLUSH_POLLS,
     POLL_INTERVAL,
     RELAY_PIN,
     WEB_HOST,
     WEB_PORT,
 )
+from dew_heater_controller.jsonutil import dumps as json_dumps
 from dew_heater_controller.live import LiveBroker
 from dew_heater_controller.logs import (
+    CsvLogWriter,
+    compact_old_logs,
     event_log_path,
     load_readings_range,
-    log_event,
-    log_reading,
     readings_log_path,
 )
 from dew_heater_controller.metrics import dew_point_c
+from dew_heater_controller.net import HTTP_SESSION
 from dew_heater_controller.state import ControllerState
+from dew_heater_controller.store import ReadingsStore
 from dew_heater_controller.weather import AmbientWeatherFetcher, build_7timer_graph_url
 
 app = Flask(__name__)
@@ -69,50 +84,94 @@ LOGGER = logging.getLogger("dew_heater")
 controller_state = ControllerState()
 live_broker = LiveBroker()
 ambient_fetcher = AmbientWeatherFetcher()
+readings_store = ReadingsStore()
+
+
+_IMAGE_NAME_RE = re.compile(r"^image-(\d{14})\.jpe?g$", re.IGNORECASE)
+#: Seconds a latest-image lookup stays valid before the folders are re-checked.
+LATEST_IMAGE_CACHE_SECONDS = 5.0
+#: (checked_at_monotonic, path, parent_dir_mtime, root_mtime) from the last
+#: successful scan.
+_latest_image_cache: tuple[float, str, float, float] | None = None
 
 
 def find_latest_image_path() -> str | None:
-    """Return the most recent AllSky JPG named image-YYYYMMDDHHMMSS.jpg."""
+    """Return the most recent AllSky JPG, re-scanning folders only when stale.
+
+    Every browser refresh hits this via /api/latest-image and /latest-image,
+    so the result is memoized for a few seconds and, past that, revalidated
+    with a single stat of the containing folder before walking anything.
+    """
+    global _latest_image_cache
+    now = time.monotonic()
+    if _latest_image_cache is not None:
+        checked_at, cached_path, dir_mtime, root_mtime = _latest_image_cache
+        if now - checked_at < LATEST_IMAGE_CACHE_SECONDS:
+            return cached_path
+        try:
+            # Stat both levels: the dated folder catches new frames landing
+            # next to the cached one, while IMAGES_ROOT catches the nightly
+            # rollover creating a fresh dated folder the cached path's parent
+            # would never reflect.
+            if (
+                os.stat(os.path.dirname(cached_path)).st_mtime == dir_mtime
+                and os.stat(IMAGES_ROOT).st_mtime == root_mtime
+            ):
+                _latest_image_cache = (now, cached_path, dir_mtime, root_mtime)
+                return cached_path
+        except OSError:
+            pass
+    path = _scan_latest_image_path()
+    if path is not None:
+        try:
+            _latest_image_cache = (
+                now,
+                path,
+                os.stat(os.path.dirname(path)).st_mtime,
+                os.stat(IMAGES_ROOT).st_mtime,
+            )
+        except OSError:
+            _latest_image_cache = None
+    else:
+        _latest_image_cache = None
+    return path
+
+
+def _scan_latest_image_path() -> str | None:
+    """Walk the dated AllSky folders for the newest image-YYYYMMDDHHMMSS.jpg."""
     if not IMAGES_ROOT.exists():
         return None
 
-    pattern = re.compile(r"^image-(\d{14})\.jpe?g$", re.IGNORECASE)
-    candidates: list[tuple[datetime, Path]] = []
+    match = _IMAGE_NAME_RE.match
+    try:
+        folders = [
+            path
+            for path in IMAGES_ROOT.iterdir()
+            if path.is_dir() and path.name.isdigit()
+        ]
+    except FileNotFoundError:
+        return None
+    folders.sort(key=lambda p: p.name, reverse=True)
 
-    def iter_candidate_folders():
+    # Folders are dated and sorted newest-first, so the first folder with a
+    # matching file holds the latest image; no cross-folder sort needed.
+    for folder in folders[:10]:
         try:
-            folders = [
-                path
-                for path in IMAGES_ROOT.iterdir()
-                if path.is_dir() and path.name.isdigit()
-            ]
-        except FileNotFoundError:
-            return []
-        folders.sort(key=lambda p: p.name, reverse=True)
-        return folders[:10]
-
-    for folder in iter_candidate_folders():
-        try:
-            entries = list(folder.iterdir())
+            with os.scandir(folder) as entries:
+                best = max(
+                    (
+                        entry
+                        for entry in entries
+                        if match(entry.name) and entry.is_file(follow_symlinks=False)
+                    ),
+                    key=lambda entry: entry.name,
+                    default=None,
+                )
         except (FileNotFoundError, PermissionError):
             continue
-        for entry in entries:
-            if not entry.is_file():
-                continue
-            match = pattern.match(entry.name)
-            if not match:
-                continue
-            ts_raw = match.group(1)
-            try:
-                ts = datetime.strptime(ts_raw, "%Y%m%d%H%M%S")
-            except ValueError:
-                continue
-            candidates.append((ts, entry))
-
-    if not candidates:
-        return None
-    candidates.sort(key=lambda item: item[0], reverse=True)
-    return str(candidates[0][1])
+        if best is not None:
+            return best.path
+    return None
 
 
 def set_relay(state_on: bool):
@@ -163,18 +222,42 @@ def api_readings():
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
 
-    data = load_readings_range(start_dt, end_dt)
-    return jsonify(
-        {
-            "timestamps": [item["timestamp"] for item in data],
-            "temperature_c": [item["temp_c"] for item in data],
-            "humidity_pct": [item["humidity_pct"] for item in data],
-            "dew_point_c": [item["dew_point_c"] for item in data],
-            "relay_state": [item["relay_on"] for item in data],
-            "start": start_dt.isoformat(),
-            "end": end_dt.isoformat(),
-        }
-    )
+    data = readings_store.load_range(start_dt, end_dt)
+    if not data:
+        # Nothing in the database for this range; serve the CSV archive.
+        data = load_readings_range(start_dt, end_dt)
+    elif start_dt < datetime.fromisoformat(data[0]["timestamp"]):
+        # The range starts before the database's first row, so the head of
+        # the chart would silently go missing; backfill it from the CSV
+        # archive up to (not including) the earliest database timestamp.
+        earliest_iso = data[0]["timestamp"]
+        head = [
+            row
+            for row in load_readings_range(start_dt, datetime.fromisoformat(earliest_iso))
+            if row["timestamp"] < earliest_iso
+        ]
+        data = head + data
+    timestamps: list[str] = []
+    temperatures: list[float] = []
+    humidities: list[float] = []
+    dew_points: list[float] = []
+    relay_states: list[bool] = []
+    for item in data:
+        timestamps.append(item["timestamp"])
+        temperatures.append(item["temp_c"])
+        humidities.append(item["humidity_pct"])
+        dew_points.append(item["dew_point_c"])
+        relay_states.append(item["relay_on"])
+    payload = {
+        "timestamps": timestamps,
+        "temperature_c": temperatures,
+        "humidity_pct": humidities,
+        "dew_point_c": dew_points,
+        "relay_state": relay_states,
+        "start": start_dt.isoformat(),
+        "end": end_dt.isoformat(),
+    }
+    return Response(json_dumps(payload), mimetype="application/json")
 
 
 @app.route("/api/control", methods=["GET", "POST"])
@@ -207,17 +290,27 @@ def api_control():
 
 @app.route("/api/live")
 def api_live():
-    q = live_broker.subscribe()
+    sub = live_broker.subscribe()
+    # SSE updates are tiny; disable Nagle so each frame goes out immediately.
+    socket_obj = request.environ.get("werkzeug.socket")
+    if socket_obj is not None:
+        try:
+            socket_obj.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
 
     def event_stream():
         try:
             while True:
-                data = q.get()
-                yield f"data: {json.dumps(data)}\n\n"
-        except GeneratorExit:
-            live_broker.unsubscribe(q)
+                sub.wait()
+                frames = sub.drain()
+                if frames:
+                    # Frames arrive pre-serialized from the broker; coalesce
+                    # whatever is ready so the WSGI layer does one send().
+                    yield b"".join(frames)
         finally:
-            live_broker.unsubscribe(q)
+            # finally also runs on generator close, so no GeneratorExit clause.
+            live_broker.unsubscribe(sub)
 
     headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     return Response(stream_with_context(event_stream()), headers=headers, mimetype="text/event-stream")
@@ -249,31 +342,67 @@ def _extract_image_src(html: str, base_url: str) -> str | None:
     return urljoin(base_url, parser.src)
 
 
+#: Seconds the proxied public AllSky image is served from cache before revalidating.
+PUBLIC_IMAGE_CACHE_SECONDS = 30.0
+_public_image_cache = {
+    "body": None,
+    "mime": "image/jpeg",
+    "etag": None,
+    "last_modified": None,
+    "image_url": None,
+    "fetched_at": 0.0,
+}
+
+
+def _cached_image_response():
+    return send_file(BytesIO(_public_image_cache["body"]), mimetype=_public_image_cache["mime"])
+
+
 def _public_image_response():
     if not ALLSKY_PUBLIC_URL:
         return None
+    cache = _public_image_cache
+    now = time.monotonic()
+    if cache["body"] is not None and now - cache["fetched_at"] < PUBLIC_IMAGE_CACHE_SECONDS:
+        return _cached_image_response()
     try:
-        resp = requests.get(ALLSKY_PUBLIC_URL, timeout=10)
+        resp = HTTP_SESSION.get(ALLSKY_PUBLIC_URL, timeout=10)
         resp.raise_for_status()
     except Exception as exc:
         LOGGER.warning("Failed to fetch public AllSky page: %s", exc)
-        return None
+        return _cached_image_response() if cache["body"] is not None else None
     content_type = (resp.headers.get("Content-Type") or "").lower()
     if content_type.startswith("image/"):
-        mime = resp.headers.get("Content-Type", "image/jpeg")
-        return send_file(BytesIO(resp.content), mimetype=mime)
-    image_url = _extract_image_src(resp.text, ALLSKY_PUBLIC_URL)
-    if not image_url:
-        LOGGER.warning("No <img> tag found on AllSky public page; cannot display image.")
-        return None
-    try:
-        img_resp = requests.get(image_url, timeout=10)
-        img_resp.raise_for_status()
-    except Exception as exc:
-        LOGGER.warning("Failed to fetch AllSky image at %s: %s", image_url, exc)
-        return None
-    mime = img_resp.headers.get("Content-Type", "image/jpeg")
-    return send_file(BytesIO(img_resp.content), mimetype=mime)
+        img_resp = resp
+        image_url = ALLSKY_PUBLIC_URL
+    else:
+        image_url = _extract_image_src(resp.text, ALLSKY_PUBLIC_URL)
+        if not image_url:
+            LOGGER.warning("No <img> tag found on AllSky public page; cannot display image.")
+            return _cached_image_response() if cache["body"] is not None else None
+        # Revalidate instead of re-downloading when the image has not changed.
+        headers = {}
+        if image_url == cache["image_url"]:
+            if cache["etag"]:
+                headers["If-None-Match"] = cache["etag"]
+            if cache["last_modified"]:
+                headers["If-Modified-Since"] = cache["last_modified"]
+        try:
+            img_resp = HTTP_SESSION.get(image_url, headers=headers, timeout=10)
+            if img_resp.status_code == 304 and cache["body"] is not None:
+                cache["fetched_at"] = now
+                return _cached_image_response()
+            img_resp.raise_for_status()
+        except Exception as exc:
+            LOGGER.warning("Failed to fetch AllSky image at %s: %s", image_url, exc)
+            return _cached_image_response() if cache["body"] is not None else None
+    cache["body"] = img_resp.content
+    cache["mime"] = img_resp.headers.get("Content-Type", "image/jpeg")
+    cache["etag"] = img_resp.headers.get("ETag")
+    cache["last_modified"] = img_resp.headers.get("Last-Modified")
+    cache["image_url"] = image_url
+    cache["fetched_at"] = now
+    return _cached_image_response()
 
 
 @app.route("/api/latest-image")
@@ -326,13 +455,40 @@ def sensor_loop(stop_event: threading.Event):
     GPIO.setup(RELAY_PIN, GPIO.OUT, initial=GPIO.LOW)
     controller_state.update_relay(False)
     dht_sensor = dht11.DHT11(pin=DHT_PIN)
-    startup_time = datetime.now()
+    # LOAD_FAST beats LOAD_GLOBAL + LOAD_ATTR; bind everything the loop hits
+    # every poll (and on every log line) to locals once up front.
+    _now = datetime.now
+    _from_iso = datetime.fromisoformat
+    _info = LOGGER.info
+    _warning = LOGGER.warning
+    _stopped = stop_event.is_set
+    _wait = stop_event.wait
+    _read = dht_sensor.read
+    _snapshot = controller_state.snapshot_with_timers
+    _dew_point = dew_point_c
+    _decide = control.decide
+    _set_relay = set_relay
+    _publish = live_broker.publish
+    startup_time = _now()
     last_humidity = None
     humidity_spike_pending = False
+    csv_log = CsvLogWriter()
+    pending_readings: list[tuple[str, int, float, float, float, bool]] = []
+    pending_path = None
+    log_day = None
+    evt_path = read_path = None
+
+    def flush_pending():
+        nonlocal pending_readings
+        if not pending_readings:
+            return
+        csv_log.log_readings(pending_path, pending_readings)
+        readings_store.insert_readings(pending_readings)
+        pending_readings = []
 
     try:
-        while not stop_event.is_set():
-            result = dht_sensor.read()
+        while not _stopped():
+            result = _read()
             if result.is_valid():
                 temp_c = float(result.temperature)
                 humidity = float(result.humidity)
@@ -342,15 +498,15 @@ def sensor_loop(stop_event: threading.Event):
                     if change_pct > 15:
                         if not humidity_spike_pending:
                             humidity_spike_pending = True
-                            LOGGER.warning(
+                            _warning(
                                 "Humidity spike ignored once (prev %.1f%% -> %.1f%%)",
                                 last_humidity,
                                 humidity,
                             )
-                            if stop_event.wait(POLL_INTERVAL):
+                            if _wait(POLL_INTERVAL):
                                 break
                             continue
-                        LOGGER.info(
+                        _info(
                             "Humidity change persisted; accepting new baseline %.1f%% (prev %.1f%%)",
                             humidity,
                             last_humidity,
@@ -361,17 +517,22 @@ def sensor_loop(stop_event: threading.Event):
                 else:
                     humidity_spike_pending = False
                 last_humidity = humidity
-                dew_c = dew_point_c(temp_c, humidity)
-                timestamp = datetime.now().isoformat()
-                now_dt = datetime.fromisoformat(timestamp)
-                evt_path = event_log_path(now_dt)
-                read_path = readings_log_path(now_dt)
-                snapshot = controller_state.snapshot()
-                mode = snapshot["mode"]
-                relay_on = snapshot["relay_on"]
-                manual_target = snapshot["manual_on"]
-                weather = ambient_fetcher.get_weather()
-                controller_state.update_weather(weather)
+                dew_c = _dew_point(temp_c, humidity)
+                now_dt = _now()
+                timestamp = now_dt.isoformat()
+                ts_epoch = int(now_dt.timestamp())
+                if log_day != now_dt.date():
+                    log_day = now_dt.date()
+                    evt_path = event_log_path(now_dt)
+                    read_path = readings_log_path(now_dt)
+                    compact_old_logs(log_day)
+                snap = _snapshot()
+                mode = snap.mode
+                relay_on = snap.relay_on
+                manual_target = snap.manual_on
+                # Weather is refreshed by weather_loop; reading the snapshot
+                # keeps the sensor cadence independent of network latency.
+                weather = snap.weather
                 sunrise_dt = None
                 sunset_dt = None
                 if weather:
@@ -379,9 +540,9 @@ def sensor_loop(stop_event: threading.Event):
                     sunset_raw = weather.get("sunset")
                     try:
                         if sunrise_raw:
-                            sunrise_dt = datetime.fromisoformat(sunrise_raw)
+                            sunrise_dt = _from_iso(sunrise_raw)
                         if sunset_raw:
-                            sunset_dt = datetime.fromisoformat(sunset_raw)
+                            sunset_dt = _from_iso(sunset_raw)
                     except Exception:
                         sunrise_dt = None
                         sunset_dt = None
@@ -394,7 +555,8 @@ def sensor_loop(stop_event: threading.Event):
 
                 runtime = now_dt - startup_time
                 auto_ready = runtime >= timedelta(minutes=15)
-                run_until, cooldown_until = controller_state.get_timers()
+                run_until = snap.auto_run_until
+                cooldown_until = snap.auto_cooldown_until
                 if run_until and now_dt >= run_until:
                     controller_state.clear_forced_run()
                     run_until = None
@@ -426,102 +588,81 @@ def sensor_loop(stop_event: threading.Event):
                     cooldown_until = run_until + FORCE_RUN_COOLDOWN
                     controller_state.start_forced_run(run_until, cooldown_until)
                     in_forced_run = True
-                    LOGGER.info(
+                    _info(
                         "Forced run started until %s (ambient temp %.1fC, dew %.1fC)",
                         run_until.isoformat(),
                         ambient_temp_c,
                         ambient_dew_c,
                     )
 
-                if mode == "manual":
-                    # Manual mode simply mirrors the requested relay state and logs transitions.
-                    if manual_target != relay_on:
-                        set_relay(manual_target)
-                        relay_on = manual_target
-                        log_event(evt_path, timestamp, temp_c, humidity, dew_c, relay_on)
-                        LOGGER.info(
-                            "Manual mode -> Relay %s | Temp %.1fC Hum %.1f%% Dew %.1fC",
-                            "ON" if relay_on else "OFF",
-                            temp_c,
-                            humidity,
-                            dew_c,
-                        )
-                    else:
-                        LOGGER.info(
-                            "Manual mode holding %s | Temp %.1fC Hum %.1f%% Dew %.1fC",
-                            "ON" if relay_on else "OFF",
-                            temp_c,
-                            humidity,
-                            dew_c,
-                        )
+                state, relay_target = _decide(
+                    mode,
+                    manual_target,
+                    relay_on,
+                    in_forced_run,
+                    should_turn_on,
+                    should_turn_off,
+                    daylight_block,
+                    auto_ready,
+                    cooldown_active,
+                )
+                relay_changed = relay_target is not None and relay_target != relay_on
+                if relay_changed:
+                    _set_relay(relay_target)
+                    relay_on = relay_target
+                    csv_log.log_event(evt_path, timestamp, ts_epoch, temp_c, humidity, dew_c, relay_on)
+
+                if state == control.MANUAL:
+                    _info(
+                        "Manual mode %s %s | Temp %.1fC Hum %.1f%% Dew %.1fC",
+                        "->" if relay_changed else "holding",
+                        "ON" if relay_on else "OFF",
+                        temp_c,
+                        humidity,
+                        dew_c,
+                    )
+                elif state == control.FORCED_RUN:
+                    _info(
+                        "Forced run active | Temp %.1fC Hum %.1f%% Dew %.1fC (runs until %s)",
+                        temp_c,
+                        humidity,
+                        dew_c,
+                        run_until.isoformat() if run_until else "soon",
+                    )
+                elif state == control.DAYLIGHT_BLOCK:
+                    _info("Daylight block active; skipping auto ON")
+                elif state == control.WARMUP:
+                    warmup_remaining = max(
+                        0.0, (timedelta(minutes=15) - runtime).total_seconds() / 60.0
+                    )
+                    _info(
+                        "Warm-up period active (%.1f min remaining); skipping auto ON",
+                        warmup_remaining,
+                    )
+                elif state == control.COOLDOWN:
+                    _info(
+                        "Cooldown active (until %s); skipping auto ON",
+                        cooldown_until.isoformat() if cooldown_until else "n/a",
+                    )
                 else:
-                    # Automatic control with optional predictive “forced runs” based on forecasts.
-                    if in_forced_run:
-                        if not relay_on:
-                            set_relay(True)
-                            relay_on = True
-                            log_event(evt_path, timestamp, temp_c, humidity, dew_c, True)
-                        LOGGER.info(
-                            "Forced run active | Temp %.1fC Hum %.1f%% Dew %.1fC (runs until %s)",
-                            temp_c,
-                            humidity,
-                            dew_c,
-                            run_until.isoformat() if run_until else "soon",
-                        )
-                    else:
-                        if should_turn_on and not relay_on:
-                            if daylight_block:
-                                LOGGER.info("Daylight block active; skipping auto ON")
-                            elif not auto_ready:
-                                warmup_remaining = max(
-                                    0.0, (timedelta(minutes=15) - runtime).total_seconds() / 60.0
-                                )
-                                LOGGER.info(
-                                    "Warm-up period active (%.1f min remaining); skipping auto ON",
-                                    warmup_remaining,
-                                )
-                            elif cooldown_active:
-                                LOGGER.info(
-                                    "Cooldown active (until %s); skipping auto ON",
-                                    cooldown_until.isoformat() if cooldown_until else "n/a",
-                                )
-                            else:
-                                set_relay(True)
-                                relay_on = True
-                                log_event(evt_path, timestamp, temp_c, humidity, dew_c, True)
-                                LOGGER.info(
-                                    "Auto -> Relay ON | Temp %.1fC Hum %.1f%% Dew %.1fC (ambient %.1fC, thresh %.1fC)",
-                                    temp_c,
-                                    humidity,
-                                    dew_c,
-                                    ambient_dew_c if ambient_dew_c is not None else float("nan"),
-                                    threshold_temp,
-                                )
-                        elif should_turn_off and relay_on:
-                            set_relay(False)
-                            relay_on = False
-                            log_event(evt_path, timestamp, temp_c, humidity, dew_c, False)
-                            LOGGER.info(
-                                "Auto -> Relay OFF | Temp %.1fC Hum %.1f%% Dew %.1fC (ambient %.1fC, thresh %.1fC)",
-                                temp_c,
-                                humidity,
-                                dew_c,
-                                ambient_dew_c if ambient_dew_c is not None else float("nan"),
-                                threshold_temp,
-                            )
-                        else:
-                            LOGGER.info(
-                                "Auto hold %s | Temp %.1fC Hum %.1f%% Dew %.1fC (ambient %.1fC, thresh %.1fC)",
-                                "ON" if relay_on else "OFF",
-                                temp_c,
-                                humidity,
-                                dew_c,
-                                ambient_dew_c if ambient_dew_c is not None else float("nan"),
-                                threshold_temp,
-                            )
-                # Log every reading
-                log_reading(read_path, timestamp, temp_c, humidity, dew_c, relay_on)
-                live_broker.publish(
+                    _info(
+                        "Auto %s %s | Temp %.1fC Hum %.1f%% Dew %.1fC (ambient %.1fC, thresh %.1fC)",
+                        "->" if relay_changed else "hold",
+                        "ON" if relay_on else "OFF",
+                        temp_c,
+                        humidity,
+                        dew_c,
+                        ambient_dew_c if ambient_dew_c is not None else float("nan"),
+                        threshold_temp,
+                    )
+                # Buffer every reading; batch-write once a minute to spare the SD card.
+                if pending_path != read_path:
+                    flush_pending()
+                    pending_path = read_path
+                pending_readings.append((timestamp, ts_epoch, temp_c, humidity, dew_c, relay_on))
+                if len(pending_readings) >= LOG_FLUSH_POLLS:
+                    flush_pending()
+                _publish(
                     {
                         "timestamp": timestamp,
                         "temp_c": temp_c,
@@ -534,29 +675,45 @@ def sensor_loop(stop_event: threading.Event):
                     }
                 )
             else:
-                LOGGER.warning("DHT11 read failed; code %s", result.error_code)
+                _warning("DHT11 read failed; code %s", result.error_code)
 
-            if stop_event.wait(POLL_INTERVAL):
+            if _wait(POLL_INTERVAL):
                 break
     finally:
-        set_relay(False)
+        flush_pending()
+        csv_log.close()
+        _set_relay(False)
         GPIO.cleanup()
-        LOGGER.info("Sensor loop stopped; GPIO cleaned up.")
+        _info("Sensor loop stopped; GPIO cleaned up.")
 
 
 def main():
     stop_event = threading.Event()
     sensor_thread = threading.Thread(target=sensor_loop, args=(stop_event,), daemon=True)
     sensor_thread.start()
+    weather_thread = ambient_fetcher.start_background_refresh(
+        stop_event, controller_state.update_weather
+    )
 
     try:
-        LOGGER.info("Web dashboard running on %s:%s", WEB_HOST, WEB_PORT)
-        app.run(host=WEB_HOST, port=WEB_PORT, threaded=True, use_reloader=False)
+        LOGGER.info(
+            "Web dashboard running on %s:%s (%s)",
+            WEB_HOST,
+            WEB_PORT,
+            "gevent" if _HAS_GEVENT else "werkzeug",
+        )
+        if _HAS_GEVENT:
+            from gevent.pywsgi import WSGIServer
+
+            WSGIServer((WEB_HOST, WEB_PORT), app).serve_forever()
+        else:
+            app.run(host=WEB_HOST, port=WEB_PORT, threaded=True, use_reloader=False)
     except KeyboardInterrupt:
         LOGGER.info("Shutdown requested; stopping threads.")
     finally:
         stop_event.set()
         sensor_thread.join()
+        weather_thread.join()
         LOGGER.info("Exited cleanly.")
 
 
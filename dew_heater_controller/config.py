@@ -22,8 +22,16 @@ RELAY_PIN = int(os.environ.get("DEW_RELAY_PIN", "26"))
 HYSTERESIS_C = float(os.environ.get("DEW_HYSTERESIS_C", "5.0"))
 #: Filesystem directory that stores CSV log files.
 LOG_DIR = Path(os.environ.get("DEW_LOG_DIR", "Temp_Humidity_Logs"))
+#: SQLite database that backs dashboard range queries (CSV stays as archive).
+DB_PATH = Path(os.environ.get("DEW_DB_PATH", str(LOG_DIR / "readings.db")))
 #: Seconds between DHT11 polls.
 POLL_INTERVAL = int(os.environ.get("DEW_POLL_INTERVAL", "10"))
+#: Number of polls to buffer readings in memory before writing them to CSV.
+LOG_FLUSH_POLLS = int(os.environ.get("DEW_LOG_FLUSH_POLLS", "6"))
+#: Days after which daily CSV logs get gzip-compressed in place.
+LOG_COMPRESS_AFTER_DAYS = int(os.environ.get("DEW_LOG_COMPRESS_AFTER_DAYS", "7"))
+#: Days of CSV history to keep before files are deleted outright.
+LOG_RETENTION_DAYS = int(os.environ.get("DEW_LOG_RETENTION_DAYS", "90"))
 #: Default time range shown on the dashboard charts.
 DEFAULT_RANGE_HOURS = float(os.environ.get("DEW_DEFAULT_RANGE_HOURS", "6"))
 
@@ -0,0 +1,86 @@
+"""Relay decision logic for the sensor loop.
+
+The per-poll inputs (mode, forced-run timers, dew threshold crossings, and
+the daylight/warm-up/cooldown gates) collapse into a single state tag, and a
+table maps each tag to the relay target. This replaces the nested branch
+tree that used to live inline in the sensor loop and makes each poll's
+decision a tag plus one lookup.
+"""
+
+from __future__ import annotations
+
+# Control states; each poll resolves to exactly one.
+MANUAL = "manual"
+FORCED_RUN = "forced_run"
+DAYLIGHT_BLOCK = "daylight_block"
+WARMUP = "warmup"
+COOLDOWN = "cooldown"
+AUTO_ON = "auto_on"
+AUTO_OFF = "auto_off"
+HOLD = "hold"
+
+#: Desired relay state per control state; None leaves the relay untouched.
+RELAY_TARGETS = {
+    FORCED_RUN: True,
+    DAYLIGHT_BLOCK: None,
+    WARMUP: None,
+    COOLDOWN: None,
+    AUTO_ON: True,
+    AUTO_OFF: False,
+    HOLD: None,
+}
+
+
+def classify(
+    mode: str,
+    relay_on: bool,
+    in_forced_run: bool,
+    should_turn_on: bool,
+    should_turn_off: bool,
+    daylight_block: bool,
+    auto_ready: bool,
+    cooldown_active: bool,
+) -> str:
+    """Collapse the per-poll inputs into a single control state tag."""
+    if mode == "manual":
+        return MANUAL
+    if in_forced_run:
+        return FORCED_RUN
+    if should_turn_on and not relay_on:
+        if daylight_block:
+            return DAYLIGHT_BLOCK
+        if not auto_ready:
+            return WARMUP
+        if cooldown_active:
+            return COOLDOWN
+        return AUTO_ON
+    if should_turn_off and relay_on:
+        return AUTO_OFF
+    return HOLD
+
+
+def decide(
+    mode: str,
+    manual_target: bool,
+    relay_on: bool,
+    in_forced_run: bool,
+    should_turn_on: bool,
+    should_turn_off: bool,
+    daylight_block: bool,
+    auto_ready: bool,
+    cooldown_active: bool,
+) -> tuple[str, bool | None]:
+    """Return (state, relay_target); a None relay_target means hold as-is."""
+    state = classify(
+        mode,
+        relay_on,
+        in_forced_run,
+        should_turn_on,
+        should_turn_off,
+        daylight_block,
+        auto_ready,
+        cooldown_active,
+    )
+    if state == MANUAL:
+        return state, manual_target
+    return state, RELAY_TARGETS[state]
@@ -0,0 +1,31 @@
+"""JSON encode/decode helpers with optional orjson acceleration.
+
+orjson serializes and parses in C and is noticeably faster than the stdlib
+for the multi-thousand-element payloads the dashboard ships; it is optional
+so the controller still runs on a plain stdlib install.
+"""
+
+from __future__ import annotations
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(data):
+        return orjson.loads(data)
+
+else:
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def loads(data):
+        return json.loads(data)
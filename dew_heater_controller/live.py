@@ -2,39 +2,70 @@
 
 from __future__ import annotations
 
-import queue
 import threading
+from collections import deque
+
+from .jsonutil import dumps
+
+
+class LiveSubscriber:
+    """Bounded per-client event buffer.
+
+    The deque's maxlen drops the oldest update automatically when a slow SSE
+    client falls behind, so the publisher never blocks or juggles full-queue
+    retries; it just appends and sets the ready event.
+    """
+
+    __slots__ = ("_events", "_ready")
+
+    def __init__(self, maxlen: int = 5):
+        self._events: deque = deque(maxlen=maxlen)
+        self._ready = threading.Event()
+
+    def push(self, item):
+        self._events.append(item)
+        self._ready.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def drain(self) -> list:
+        """Return all buffered events, oldest first."""
+        self._ready.clear()
+        items = []
+        while True:
+            try:
+                items.append(self._events.popleft())
+            except IndexError:
+                return items
 
 
 class LiveBroker:
     """Allows the web layer to stream sensor updates via Server Sent Events."""
 
     def __init__(self):
-        self._subscribers: set[queue.Queue] = set()
+        # Keyed by id() so unsubscribe is an O(1) pop without hashing the
+        # subscriber object, and calling it twice is harmless.
+        self._subscribers: dict[int, LiveSubscriber] = {}
         self._lock = threading.Lock()
+        self._seq = 0
 
-    def subscribe(self) -> queue.Queue:
-        q: queue.Queue = queue.Queue(maxsize=5)
+    def subscribe(self) -> LiveSubscriber:
+        sub = LiveSubscriber()
         with self._lock:
-            self._subscribers.add(q)
-        return q
+            self._subscribers[id(sub)] = sub
+        return sub
 
-    def unsubscribe(self, q: queue.Queue):
+    def unsubscribe(self, sub: LiveSubscriber):
         with self._lock:
-            self._subscribers.discard(q)
+            self._subscribers.pop(id(sub), None)
 
-    def publish(self, data: dict):
+    def publish(self, data):
+        """Serialize the update once and fan the same bytes out to every subscriber."""
         with self._lock:
-            subscribers = list(self._subscribers)
-        for q in subscribers:
-            try:
-                q.put_nowait(data)
-            except queue.Full:
-                try:
-                    q.get_nowait()
-                except queue.Empty:
-                    pass
-                try:
-                    q.put_nowait(data)
-                except queue.Full:
-                    continue
+            self._seq += 1
+            seq = self._seq
+            subscribers = list(self._subscribers.values())
+        frame = b"event: reading\nid: " + str(seq).encode("ascii") + b"\ndata: " + dumps(data) + b"\n\n"
+        for sub in subscribers:
+            sub.push(frame)
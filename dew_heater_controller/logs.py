@@ -3,18 +3,27 @@
 from __future__ import annotations
 
 import csv
-from datetime import datetime, timedelta
+import gzip
+import logging
+import re
+import shutil
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import IO
 
-from .config import LOG_DIR
+from .config import LOG_COMPRESS_AFTER_DAYS, LOG_DIR, LOG_RETENTION_DAYS
 
+LOGGER = logging.getLogger("dew_heater.logs")
 
-def ensure_log_header(path: Path, header: list[str]):
-    if not path.exists():
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", newline="") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(header)
+CSV_HEADER = ["timestamp_iso", "ts_epoch", "temp_c", "humidity_pct", "dew_point_c", "relay_state"]
+
+_LOG_NAME_RE = re.compile(
+    r"^dew_heater_(?:readings|events)_(\d{4}-\d{2}-\d{2})(?:\.v\d+)?\.csv(\.gz)?$"
+)
+
+#: Most log files kept open at once; handles are evicted in insertion order,
+#: so files from rolled-over days go first.
+_MAX_OPEN_FILES = 4
 
 
 def event_log_path(now: datetime) -> Path:
@@ -25,57 +34,176 @@ def readings_log_path(now: datetime) -> Path:
     return LOG_DIR / f"dew_heater_readings_{now.strftime('%Y-%m-%d')}.csv"
 
 
-def log_event(path: Path, timestamp: str, temp_c: float, humidity: float, dew_c: float, state_on: bool):
-    ensure_log_header(path, ["timestamp_iso", "temp_c", "humidity_pct", "dew_point_c", "relay_state"])
-    with path.open("a", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([timestamp, f"{temp_c:.1f}", f"{humidity:.1f}", f"{dew_c:.1f}", "on" if state_on else "off"])
+def _existing_header(path: Path) -> list[str] | None:
+    try:
+        with path.open("r", newline="") as csvfile:
+            return next(csv.reader(csvfile), None)
+    except OSError:
+        return None
+
+
+def _format_row(
+    timestamp: str, ts_epoch: int, temp_c: float, humidity: float, dew_c: float, state_on: bool
+) -> list[str]:
+    return [
+        timestamp,
+        str(ts_epoch),
+        f"{temp_c:.1f}",
+        f"{humidity:.1f}",
+        f"{dew_c:.1f}",
+        "on" if state_on else "off",
+    ]
 
 
-def log_reading(path: Path, timestamp: str, temp_c: float, humidity: float, dew_c: float, relay_on: bool):
-    ensure_log_header(path, ["timestamp_iso", "temp_c", "humidity_pct", "dew_point_c", "relay_state"])
-    with path.open("a", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([timestamp, f"{temp_c:.1f}", f"{humidity:.1f}", f"{dew_c:.1f}", "on" if relay_on else "off"])
+class CsvLogWriter:
+    """Appends CSV rows through cached file handles.
+
+    Opening, writing one row, and closing a file every poll costs several
+    syscalls per cycle and wears the SD card; instead handles stay open
+    (buffered) across writes, the header is written only when a file is first
+    created, and callers flush explicitly on shutdown.
+    """
+
+    def __init__(self):
+        self._open_files: dict[Path, tuple[IO[str], object]] = {}
+
+    def _writer_for(self, path: Path):
+        entry = self._open_files.get(path)
+        if entry is not None:
+            return entry[1]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not path.exists() or path.stat().st_size == 0
+        if not is_new and _existing_header(path) != CSV_HEADER:
+            # A file left over from before a column change: appending rows in
+            # the current layout would be mis-parsed through its stale header.
+            # Rotate it aside (the archive scan still reads it by its own
+            # header) and start a fresh file with the current header.
+            rotated = path.with_name(f"{path.stem}.v1.csv")
+            version = 1
+            while rotated.exists():
+                version += 1
+                rotated = path.with_name(f"{path.stem}.v{version}.csv")
+            path.rename(rotated)
+            is_new = True
+        handle = path.open("a", newline="", buffering=8192)
+        writer = csv.writer(handle)
+        if is_new:
+            writer.writerow(CSV_HEADER)
+        self._open_files[path] = (handle, writer)
+        # Evict in insertion order (dicts preserve it): the entry just added
+        # sits last, so the writer being returned is never closed here.
+        while len(self._open_files) > _MAX_OPEN_FILES:
+            oldest = next(iter(self._open_files))
+            stale_handle, _ = self._open_files.pop(oldest)
+            stale_handle.close()
+        return writer
+
+    def log_event(
+        self, path: Path, timestamp: str, ts_epoch: int, temp_c: float, humidity: float, dew_c: float, state_on: bool
+    ):
+        self._writer_for(path).writerow(_format_row(timestamp, ts_epoch, temp_c, humidity, dew_c, state_on))
+
+    def log_readings(self, path: Path, rows: list[tuple[str, int, float, float, float, bool]]):
+        self._writer_for(path).writerows(_format_row(*row) for row in rows)
+
+    def flush(self):
+        for handle, _ in self._open_files.values():
+            handle.flush()
+
+    def close(self):
+        for handle, _ in self._open_files.values():
+            handle.close()
+        self._open_files.clear()
+
+
+def compact_old_logs(today: date | None = None):
+    """Gzip daily CSVs past the compression age and delete those past retention.
+
+    Without this the log directory grows by two files per day forever, which
+    both eats SD-card space and slows the archive scans.
+    """
+    if today is None:
+        today = date.today()
+    if not LOG_DIR.exists():
+        return
+    compress_before = (today - timedelta(days=LOG_COMPRESS_AFTER_DAYS)).isoformat()
+    delete_before = (today - timedelta(days=LOG_RETENTION_DAYS)).isoformat()
+    for path in LOG_DIR.iterdir():
+        match = _LOG_NAME_RE.match(path.name)
+        if not match:
+            continue
+        day, compressed = match.group(1), match.group(2)
+        try:
+            if day < delete_before:
+                path.unlink()
+            elif compressed is None and day < compress_before:
+                gz_path = path.parent / (path.name + ".gz")
+                with path.open("rb") as src, gzip.open(gz_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                path.unlink()
+        except OSError as exc:
+            LOGGER.warning("Log compaction failed for %s: %s", path, exc)
+
+
+def _read_csv_rows(log_path: Path, start_iso: str, end_iso: str, records: list[dict]):
+    """Append rows from one daily CSV (plain or gzipped) inside [start_iso, end_iso]."""
+    opener = gzip.open if log_path.suffix == ".gz" else open
+    with opener(log_path, "rt", newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if not header:
+            return
+        try:
+            ts_i = header.index("timestamp_iso")
+            temp_i = header.index("temp_c")
+            hum_i = header.index("humidity_pct")
+            dew_i = header.index("dew_point_c")
+            relay_i = header.index("relay_state")
+        except ValueError:
+            return
+        append = records.append
+        for row in reader:
+            try:
+                ts_raw = row[ts_i]
+                if not ts_raw or not (start_iso <= ts_raw <= end_iso):
+                    continue
+                append(
+                    {
+                        "timestamp": ts_raw,
+                        "temp_c": float(row[temp_i]),
+                        "humidity_pct": float(row[hum_i]),
+                        "dew_point_c": float(row[dew_i]),
+                        "relay_on": row[relay_i].strip().lower() == "on",
+                    }
+                )
+            except (ValueError, IndexError):
+                continue
 
 
 def load_readings_range(start_dt: datetime, end_dt: datetime) -> list[dict]:
-    """Load readings from CSV logs within the inclusive [start_dt, end_dt] range."""
+    """Load readings from CSV logs within the inclusive [start_dt, end_dt] range.
+
+    This is the archive fallback for history predating the SQLite store.
+    ISO-8601 timestamps sort lexicographically, so rows are filtered with
+    plain string comparisons instead of allocating a datetime per row.
+    """
     records: list[dict] = []
+    start_iso = start_dt.isoformat()
+    end_iso = end_dt.isoformat()
     current_day = start_dt.date()
     end_day = end_dt.date()
 
     while current_day <= end_day:
-        log_path = LOG_DIR / f"dew_heater_readings_{current_day.isoformat()}.csv"
+        stem = f"dew_heater_readings_{current_day.isoformat()}"
+        log_path = LOG_DIR / f"{stem}.csv"
+        if not log_path.exists():
+            log_path = LOG_DIR / f"{stem}.csv.gz"
         if log_path.exists():
-            with log_path.open("r", newline="") as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    ts_raw = row.get("timestamp_iso")
-                    if not ts_raw:
-                        continue
-                    try:
-                        ts = datetime.fromisoformat(ts_raw)
-                    except ValueError:
-                        continue
-                    if not (start_dt <= ts <= end_dt):
-                        continue
-                    try:
-                        temp = float(row["temp_c"])
-                        humidity = float(row["humidity_pct"])
-                        dew = float(row["dew_point_c"])
-                    except (ValueError, KeyError):
-                        continue
-                    relay_raw = (row.get("relay_state") or "").strip().lower()
-                    records.append(
-                        {
-                            "timestamp": ts.isoformat(),
-                            "temp_c": temp,
-                            "humidity_pct": humidity,
-                            "dew_point_c": dew,
-                            "relay_on": relay_raw == "on",
-                        }
-                    )
+            _read_csv_rows(log_path, start_iso, end_iso, records)
+        # Files rotated aside on a header change still hold that day's older
+        # rows; each carries its own header, so they parse correctly.
+        for rotated in sorted(LOG_DIR.glob(f"{stem}.v*.csv*")):
+            _read_csv_rows(rotated, start_iso, end_iso, records)
         current_day += timedelta(days=1)
 
     records.sort(key=lambda entry: entry["timestamp"])
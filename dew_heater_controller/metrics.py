@@ -1,11 +1,30 @@
 """Math helpers for dew point calculations."""
 
-import math
+from math import log
+
+#: Magnus approximation coefficients.
+_MAGNUS_A = 17.27
+_MAGNUS_B = 237.7
 
 
 def dew_point_c(temp_c: float, humidity: float) -> float:
     """Magnus approximation for dew point in Celsius."""
-    a = 17.27
-    b = 237.7
-    gamma = (a * temp_c / (b + temp_c)) + math.log(humidity / 100.0)
-    return (b * gamma) / (a - gamma)
+    gamma = (_MAGNUS_A * temp_c / (_MAGNUS_B + temp_c)) + log(humidity * 0.01)
+    return (_MAGNUS_B * gamma) / (_MAGNUS_A - gamma)
+
+
+def dew_point_c_many(temps_c, humidities) -> list[float]:
+    """Compute dew points for parallel sequences of readings in one pass.
+
+    Keeps constants and the log function in locals so batch recomputes over
+    historical rows avoid per-call global lookups.
+    """
+    a = _MAGNUS_A
+    b = _MAGNUS_B
+    _log = log
+    out: list[float] = []
+    append = out.append
+    for temp_c, humidity in zip(temps_c, humidities):
+        gamma = (a * temp_c / (b + temp_c)) + _log(humidity * 0.01)
+        append((b * gamma) / (a - gamma))
+    return out
@@ -0,0 +1,32 @@
+"""Shared HTTP session with connection pooling and retries."""
+
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session() -> requests.Session:
+    """Build the session reused for every upstream fetch.
+
+    Pooled keep-alive connections skip the TCP + TLS handshake that a bare
+    requests.get pays on each weather or image fetch, and the small retry
+    budget smooths transient network blips without hiding real outages.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.5),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Ask for gzip explicitly so the weather payloads come back compressed
+    # even if a proxy strips the library's default encoding header.
+    session.headers["Accept-Encoding"] = "gzip"
+    session.headers["Accept"] = "application/json"
+    return session
+
+
+HTTP_SESSION = build_session()
@@ -3,65 +3,98 @@
 from __future__ import annotations
 
 import threading
+from dataclasses import dataclass, replace
 from datetime import datetime
 
 
+@dataclass(frozen=True, slots=True)
+class ControlSnapshot:
+    """Immutable controller state; writers publish a fresh instance per change."""
+
+    mode: str = "auto"
+    manual_on: bool = False
+    relay_on: bool = False
+    weather: dict | None = None
+    auto_run_until: datetime | None = None
+    auto_cooldown_until: datetime | None = None
+    #: ISO renderings of the timers, formatted once on write.
+    run_until_iso: str | None = None
+    cooldown_until_iso: str | None = None
+
+
 class ControllerState:
-    """Tracks relay mode, manual overrides, and forced-run timers."""
+    """Tracks relay mode, manual overrides, and forced-run timers.
+
+    Reads are lock-free: the whole state lives in one frozen dataclass and
+    each writer publishes a modified copy by rebinding ``self._state``, which
+    the GIL makes atomic. Only writers serialize on the lock, so snapshots
+    taken by the web threads never contend with the sensor loop.
+    """
 
     def __init__(self):
         self._lock = threading.Lock()
-        self.mode = "auto"
-        self.manual_on = False
-        self.relay_on = False
-        self.weather: dict | None = None
-        self.auto_run_until: datetime | None = None
-        self.auto_cooldown_until: datetime | None = None
+        self._state = ControlSnapshot()
+        self._cached_snapshot: tuple[ControlSnapshot, dict] | None = None
+
+    def snapshot_with_timers(self) -> ControlSnapshot:
+        """Return the current immutable state; no lock, no allocation."""
+        return self._state
 
     def snapshot(self) -> dict:
+        """Return the state as a dict; cached until the next mutation.
+
+        Writers always publish a fresh ControlSnapshot, so object identity
+        doubles as the version counter: while ``self._state`` is the same
+        object, the previously built dict is still accurate and the steady
+        read path allocates nothing. The cache is a single (state, dict)
+        tuple published by one reference assignment, so concurrent rebuilds
+        can only ever install a coherent pairing. Callers treat the dict as
+        read-only.
+        """
+        s = self._state
+        cached = self._cached_snapshot
+        if cached is not None and cached[0] is s:
+            return cached[1]
+        snap = {
+            "mode": s.mode,
+            "manual_on": s.manual_on,
+            "relay_on": s.relay_on,
+            "weather": s.weather,
+            "auto_run_until": s.run_until_iso,
+            "auto_cooldown_until": s.cooldown_until_iso,
+        }
+        self._cached_snapshot = (s, snap)
+        return snap
+
+    def _publish(self, **changes):
         with self._lock:
-            return {
-                "mode": self.mode,
-                "manual_on": self.manual_on,
-                "relay_on": self.relay_on,
-                "weather": self.weather,
-                "auto_run_until": self.auto_run_until.isoformat() if self.auto_run_until else None,
-                "auto_cooldown_until": (
-                    self.auto_cooldown_until.isoformat() if self.auto_cooldown_until else None
-                ),
-            }
+            self._state = replace(self._state, **changes)
 
     def set_mode(self, mode: str, manual_on: bool | None = None):
-        with self._lock:
-            self.mode = mode
-            if manual_on is not None:
-                self.manual_on = manual_on
+        if manual_on is None:
+            self._publish(mode=mode)
+        else:
+            self._publish(mode=mode, manual_on=manual_on)
 
     def set_manual_on(self, manual_on: bool):
-        with self._lock:
-            self.manual_on = manual_on
+        self._publish(manual_on=manual_on)
 
     def update_relay(self, relay_on: bool):
-        with self._lock:
-            self.relay_on = relay_on
+        self._publish(relay_on=relay_on)
 
     def update_weather(self, weather: dict | None):
-        with self._lock:
-            self.weather = weather
+        self._publish(weather=weather)
 
     def start_forced_run(self, run_until: datetime, cooldown_until: datetime):
-        with self._lock:
-            self.auto_run_until = run_until
-            self.auto_cooldown_until = cooldown_until
+        self._publish(
+            auto_run_until=run_until,
+            auto_cooldown_until=cooldown_until,
+            run_until_iso=run_until.isoformat(),
+            cooldown_until_iso=cooldown_until.isoformat(),
+        )
 
     def clear_forced_run(self):
-        with self._lock:
-            self.auto_run_until = None
+        self._publish(auto_run_until=None, run_until_iso=None)
 
     def clear_cooldown(self):
-        with self._lock:
-            self.auto_cooldown_until = None
-
-    def get_timers(self) -> tuple[datetime | None, datetime | None]:
-        with self._lock:
-            return self.auto_run_until, self.auto_cooldown_until
+        self._publish(auto_cooldown_until=None, cooldown_until_iso=None)
@@ -0,0 +1,79 @@
+"""SQLite-backed store for sensor readings."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from .config import DB_PATH
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    ts INTEGER PRIMARY KEY,
+    temp REAL NOT NULL,
+    hum REAL NOT NULL,
+    dew REAL NOT NULL,
+    relay INTEGER NOT NULL
+)
+"""
+
+
+class ReadingsStore:
+    """Keeps a single SQLite connection open for inserts and range queries.
+
+    Scanning daily CSV files per dashboard request costs Python-level parsing
+    for every historical row; an indexed table answers range queries directly.
+    WAL journaling with NORMAL sync keeps inserts cheap on SD cards while the
+    Flask threads read concurrently with the sensor thread.
+    """
+
+    def __init__(self, db_path: Path = DB_PATH):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def insert_readings(self, rows: list[tuple[str, int, float, float, float, bool]]):
+        """Insert batched (timestamp_iso, ts_epoch, temp_c, humidity_pct, dew_point_c, relay_on) rows.
+
+        Rows arrive with the epoch second precomputed, so no per-row ISO
+        parsing happens here.
+        """
+        db_rows = [
+            (ts_epoch, temp, hum, dew, int(relay))
+            for _ts, ts_epoch, temp, hum, dew, relay in rows
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO readings (ts, temp, hum, dew, relay) VALUES (?, ?, ?, ?, ?)",
+                db_rows,
+            )
+            self._conn.commit()
+
+    def load_range(self, start_dt: datetime, end_dt: datetime) -> list[dict]:
+        """Return readings within the inclusive [start_dt, end_dt] range, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, temp, hum, dew, relay FROM readings WHERE ts BETWEEN ? AND ? ORDER BY ts",
+                (int(start_dt.timestamp()), int(end_dt.timestamp())),
+            ).fetchall()
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                "temp_c": temp,
+                "humidity_pct": hum,
+                "dew_point_c": dew,
+                "relay_on": bool(relay),
+            }
+            for ts, temp, hum, dew, relay in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
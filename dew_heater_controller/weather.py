@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import bisect
 import logging
 import math
+import random
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime
+from operator import itemgetter
 from typing import Any
-
-import requests
+from urllib.parse import urlencode
 
 from .config import (
     AMBIENT_API_URL,
@@ -19,68 +23,311 @@ from .config import (
     SEVENTIMER_GRAPH_URL,
     SEVENTIMER_URL,
 )
+from .jsonutil import loads as json_loads
+from .net import HTTP_SESSION
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 LOGGER = logging.getLogger("dew_heater.weather")
 
+#: Cache TTL in integer nanoseconds; the freshness check on every dashboard
+#: request is then a pure int compare against time.monotonic_ns().
+_AMBIENT_CACHE_NS = int(AMBIENT_CACHE_SECONDS * 1_000_000_000)
+
+#: Runs the 7timer fetch concurrently with the Open-Meteo request.
+_FETCH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-fetch")
+
+#: Coordinates rounded to two decimals (~1 km) before they go into upstream
+#: URLs, so nearby installs share upstream and CDN cache entries. The
+#: full-precision config values stay untouched for display.
+try:
+    _LAT_Q: float | str = round(float(AMBIENT_LAT), 2)
+    _LON_Q: float | str = round(float(AMBIENT_LON), 2)
+except ValueError:
+    _LAT_Q, _LON_Q = AMBIENT_LAT, AMBIENT_LON
+
+#: Both upstream query strings are constant for the life of the process, so
+#: encode them once at import instead of rebuilding a params dict per fetch.
+_AMBIENT_URL: str | None = None
+_SEVENTIMER_FETCH_URL: str | None = None
+if AMBIENT_LAT and AMBIENT_LON:
+    _AMBIENT_URL = AMBIENT_API_URL + "?" + urlencode(
+        {
+            "latitude": _LAT_Q,
+            "longitude": _LON_Q,
+            "current": "temperature_2m,dew_point_2m,relative_humidity_2m,cloud_cover,weather_code",
+            "daily": "temperature_2m_max,temperature_2m_min,sunrise,sunset",
+            # Only index [0] of each daily series is read; one day keeps the
+            # payload minimal. timezone=auto stays because sunrise/sunset are
+            # compared against local datetime.now() in the control loop.
+            "forecast_days": 1,
+            "timezone": "auto",
+        }
+    )
+    _SEVENTIMER_FETCH_URL = SEVENTIMER_URL + "?" + urlencode(
+        {"lon": _LON_Q, "lat": _LAT_Q, "product": "astro", "output": "json"}
+    )
+
+#: Static portion of the astro chart URL; only the cache-buster suffix varies
+#: per render, so everything else is encoded once here.
+_GRAPH_PREFIX = (
+    SEVENTIMER_GRAPH_URL
+    + "?"
+    + urlencode(
+        {
+            "lon": _LON_Q,
+            "lat": _LAT_Q,
+            "ac": 0,
+            "lang": "en",
+            "unit": 0,
+            "output": "internal",
+            "tzshift": 0,
+        }
+    )
+    + "&cache="
+)
+
+#: Open-Meteo WMO weather codes to display summaries.
+_CONDITIONS = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Fog",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Drizzle",
+    55: "Dense drizzle",
+    56: "Freezing drizzle",
+    57: "Dense freezing drizzle",
+    61: "Slight rain",
+    63: "Rain",
+    65: "Heavy rain",
+    66: "Freezing rain",
+    67: "Heavy freezing rain",
+    71: "Slight snow",
+    73: "Snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Rain showers",
+    81: "Rain showers",
+    82: "Violent rain showers",
+    85: "Snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with hail",
+    99: "Heavy hailstorm",
+}
+
+#: 7timer seeing/transparency levels 1-8, indexed directly by level.
+_SEEING = (
+    None,
+    "Excellent",
+    "Good",
+    "Average",
+    "Below average",
+    "Poor",
+    "Poor",
+    "Very poor",
+    "Very poor",
+)
+
+#: 7timer prec_amount levels 1-4 to approximate percent chance.
+_PRECIP_CHANCE = (None, 20, 40, 60, 80)
+
+#: Pulls the four numeric current-conditions fields in one C-level call.
+_CURRENT_FIELDS = itemgetter(
+    "temperature_2m", "dew_point_2m", "relative_humidity_2m", "cloud_cover"
+)
+
+#: Illumination curve (1 - cos(2*pi*phase)) / 2 * 100 sampled at 1/1024 steps;
+#: describe_moon_phase interpolates instead of calling libm per render.
+_ILLUM_LUT = tuple((1 - math.cos(2 * math.pi * i / 1024)) / 2 * 100 for i in range(1025))
+
+#: Reference new moon and mean synodic month used for phase estimation.
+_NEW_MOON_BASE = datetime(2000, 1, 6, 18, 14)
+_SYNODIC_DAYS = 29.53058867
+
+#: Phase-fraction boundaries between the eight named phases, for bisect.
+_PHASE_BOUNDS = (0.0625, 0.1875, 0.3125, 0.4375, 0.5625, 0.6875, 0.8125, 0.9375)
+_PHASE_LABELS = (
+    "New Moon",
+    "Waxing Crescent",
+    "First Quarter",
+    "Waxing Gibbous",
+    "Full Moon",
+    "Waning Gibbous",
+    "Last Quarter",
+    "Waning Crescent",
+    "New Moon",
+)
+
 
 class AmbientWeatherFetcher:
     """Fetch and cache ambient weather readings from an external API."""
 
     def __init__(self):
         self._last_weather: dict | None = None
-        self._last_fetch = 0.0
+        self._last_fetch = 0
+        self._last_fetch_day: date | None = None
+        self._last_etag: str | None = None
+        self._last_modified: str | None = None
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._inflight: Future | None = None
 
     def get_dew_point(self) -> float | None:
         weather = self.get_weather()
         return None if weather is None else weather.get("dew_point_c")
 
     def get_weather(self) -> dict | None:
-        now = time.monotonic()
-        if self._last_weather is not None and (now - self._last_fetch) < AMBIENT_CACHE_SECONDS:
+        now = time.monotonic_ns()
+        if (
+            self._last_weather is not None
+            and (now - self._last_fetch) < _AMBIENT_CACHE_NS
+            # Daily fields (min/max temps, sunrise/sunset) go stale at
+            # midnight even inside the TTL, so the day must match too.
+            and self._last_fetch_day == date.today()
+        ):
+            return self._last_weather
+        if self._last_weather is not None:
+            # Stale-while-revalidate: serve the stale payload immediately and
+            # refresh off the caller's thread so nobody blocks on the network.
+            self._refresh_async()
             return self._last_weather
+        return self._fetch_single_flight()
+
+    def _fetch_single_flight(self) -> dict | None:
+        """Collapse concurrent cold-cache fetches into one upstream call.
+
+        The first caller creates a Future and runs the fetch; anyone arriving
+        while it is in flight just waits on the same Future instead of firing
+        another pair of HTTPS requests at the rate-limited APIs.
+        """
+        with self._refresh_lock:
+            inflight = self._inflight
+            if inflight is None:
+                inflight = self._inflight = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return inflight.result()
+        try:
+            result = self._refresh()
+            inflight.set_result(result)
+        except BaseException as exc:
+            inflight.set_exception(exc)
+            raise
+        finally:
+            with self._refresh_lock:
+                self._inflight = None
+        return result
+
+    def _refresh(self) -> dict | None:
         try:
             weather = self._fetch()
         except Exception as exc:
             LOGGER.warning("Ambient weather fetch failed: %s", exc)
             return self._last_weather
         self._last_weather = weather
-        self._last_fetch = now
+        self._last_fetch = time.monotonic_ns()
+        self._last_fetch_day = date.today()
         return weather
 
+    def start_background_refresh(self, stop_event: threading.Event, on_refresh=None) -> threading.Thread:
+        """Keep the cache warm from a daemon thread (push, not pull).
+
+        With a scheduled refresh, dashboard requests always hit a warm cache
+        instead of one unlucky caller paying the upstream round-trip after
+        every TTL expiry. ``on_refresh`` is invoked with each result so the
+        app can mirror it into the controller state. Returns the thread so
+        the caller can join it on shutdown.
+        """
+        thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(stop_event, on_refresh),
+            name="weather-refresh",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _refresh_loop(self, stop_event: threading.Event, on_refresh):
+        while not stop_event.is_set():
+            weather = self._refresh()
+            if on_refresh is not None:
+                on_refresh(weather)
+            # Jitter by +/-10% so refreshes never lock onto the cache TTL or
+            # top-of-hour upstream load.
+            if stop_event.wait(AMBIENT_CACHE_SECONDS * random.uniform(0.9, 1.1)):
+                break
+
+    def _refresh_async(self):
+        """Kick off a single background refresh; extra callers return at once."""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def runner():
+            try:
+                self._refresh()
+            finally:
+                with self._refresh_lock:
+                    self._refreshing = False
+
+        threading.Thread(target=runner, daemon=True).start()
+
     def _fetch(self) -> dict | None:
-        if not AMBIENT_LAT or not AMBIENT_LON:
+        if _AMBIENT_URL is None:
             raise RuntimeError("AMBIENT_LAT/LON not configured")
-        params = {
-            "latitude": AMBIENT_LAT,
-            "longitude": AMBIENT_LON,
-            "current": "temperature_2m,dew_point_2m,relative_humidity_2m,cloud_cover,weather_code",
-            "daily": "temperature_2m_max,temperature_2m_min,sunrise,sunset",
-            "timezone": "auto",
-        }
-        response = requests.get(AMBIENT_API_URL, params=params, timeout=10)
+        # The two upstreams are independent; run 7timer on a pool thread while
+        # this thread waits on Open-Meteo, so a miss costs max() of the RTTs.
+        astro_future = _FETCH_POOL.submit(fetch_7timer)
+        # Revalidate with the prior response's validators; a 304 costs a few
+        # hundred bytes instead of the full payload.
+        headers = {}
+        if self._last_etag:
+            headers["If-None-Match"] = self._last_etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        response = HTTP_SESSION.get(_AMBIENT_URL, headers=headers, timeout=10)
+        if response.status_code == 304 and self._last_weather is not None:
+            return self._last_weather
         response.raise_for_status()
-        payload = response.json()
+        self._last_etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        payload = json_loads(response.content)
         current = payload.get("current") or {}
         daily = payload.get("daily") or {}
+        now = datetime.now()
         try:
-            phase_fraction = estimate_moon_phase(datetime.now())
+            phase_fraction = estimate_moon_phase(now)
             moon_phase_name, moon_illum_pct = describe_moon_phase(phase_fraction)
-            astro_weather = fetch_7timer()
+            astro_weather = astro_future.result()
             sunrise_list = daily.get("sunrise") or []
             sunset_list = daily.get("sunset") or []
             sunrise_iso = sunrise_list[0] if sunrise_list else None
             sunset_iso = sunset_list[0] if sunset_list else None
+            # One itemgetter call plus direct indexing; a missing key lands in
+            # the KeyError/TypeError handler below like the old .get(...) path.
+            temp_c, dew_c, humidity, cloud_cover = map(float, _CURRENT_FIELDS(current))
+            t_max, t_min = daily["temperature_2m_max"][0], daily["temperature_2m_min"][0]
 
             weather = {
-                "temperature_c": float(current.get("temperature_2m")),
-                "dew_point_c": float(current.get("dew_point_2m")),
-                "humidity_pct": float(current.get("relative_humidity_2m")),
-                "cloud_cover_pct": float(current.get("cloud_cover")),
-                "temp_max_c": float(daily.get("temperature_2m_max")[0]),
-                "temp_min_c": float(daily.get("temperature_2m_min")[0]),
-                "timestamp": datetime.now().isoformat(),
+                "temperature_c": temp_c,
+                "dew_point_c": dew_c,
+                "humidity_pct": humidity,
+                "cloud_cover_pct": cloud_cover,
+                "temp_max_c": float(t_max),
+                "temp_min_c": float(t_min),
+                "timestamp": now.isoformat(),
                 "location": AMBIENT_LOCATION_NAME,
-                "summary": describe_weather(current.get("weather_code"), current.get("cloud_cover")),
+                "summary": describe_weather(current.get("weather_code"), cloud_cover),
                 "moon_phase_name": moon_phase_name,
                 "moon_illumination_pct": moon_illum_pct,
                 "sunrise": sunrise_iso,
@@ -93,52 +340,67 @@ class AmbientWeatherFetcher:
         return weather
 
 
+#: Circuit breaker for the 7timer upstream: after _7TIMER_TRIP_AFTER straight
+#: failures the fetch is skipped for _7TIMER_COOLDOWN seconds, so a prolonged
+#: outage costs one timeout per cooldown window instead of one per refresh.
+_7TIMER_TRIP_AFTER = 3
+_7TIMER_COOLDOWN = 300.0
+_7timer_failures = 0
+_7timer_skip_until = 0.0
+
+
+def _describe_index(value: int | None) -> str | None:
+    if value is None:
+        return None
+    desc = _SEEING[int(value)] if 1 <= int(value) <= 8 else None
+    return f"{desc} (level {value})" if desc else f"Level {value}"
+
+
 def fetch_7timer() -> dict | None:
     """Pull 7timer astronomy forecast."""
-    if not AMBIENT_LAT or not AMBIENT_LON:
+    global _7timer_failures, _7timer_skip_until
+    if _SEVENTIMER_FETCH_URL is None:
+        return None
+    if time.monotonic() < _7timer_skip_until:
         return None
-    params = {
-        "lon": AMBIENT_LON,
-        "lat": AMBIENT_LAT,
-        "product": "astro",
-        "output": "json",
-    }
     try:
-        response = requests.get(SEVENTIMER_URL, params=params, timeout=10)
-        response.raise_for_status()
-        payload = response.json()
+        if ijson is not None:
+            # Only dataseries[0] is consumed; stream-parse and stop after the
+            # first element instead of decoding the full ~64-row forecast.
+            response = HTTP_SESSION.get(_SEVENTIMER_FETCH_URL, timeout=10, stream=True)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            first = next(ijson.items(response.raw, "dataseries.item"), None)
+            response.close()
+        else:
+            response = HTTP_SESSION.get(_SEVENTIMER_FETCH_URL, timeout=10)
+            response.raise_for_status()
+            series = json_loads(response.content).get("dataseries")
+            first = series[0] if series else None
     except Exception as exc:
-        LOGGER.warning("7timer fetch failed: %s", exc)
+        _7timer_failures += 1
+        if _7timer_failures >= _7TIMER_TRIP_AFTER:
+            _7timer_skip_until = time.monotonic() + _7TIMER_COOLDOWN
+            LOGGER.warning(
+                "7timer fetch failed %d times, pausing for %.0fs: %s",
+                _7timer_failures, _7TIMER_COOLDOWN, exc,
+            )
+        else:
+            LOGGER.warning("7timer fetch failed: %s", exc)
         return None
-    series = payload.get("dataseries")
-    if not series:
+    _7timer_failures = 0
+    if first is None:
         return None
-    first = series[0]
-
-    def describe_index(value: int | None) -> str | None:
-        if value is None:
-            return None
-        mapping = {
-            1: "Excellent",
-            2: "Good",
-            3: "Average",
-            4: "Below average",
-            5: "Poor",
-            6: "Poor",
-            7: "Very poor",
-            8: "Very poor",
-        }
-        desc = mapping.get(int(value))
-        return f"{desc} (level {value})" if desc else f"Level {value}"
 
-    seeing_desc = describe_index(first.get("seeing"))
-    transparency_desc = describe_index(first.get("transparency"))
+    seeing_desc = _describe_index(first.get("seeing"))
+    transparency_desc = _describe_index(first.get("transparency"))
     prec_type = first.get("prec_type") or "none"
     prec_amount = first.get("prec_amount")
     precip_desc = "None"
     if prec_type and prec_type != "none":
-        chance_map = {1: 20, 2: 40, 3: 60, 4: 80}
-        percent = chance_map.get(int(prec_amount) if prec_amount is not None else None, 50)
+        percent = 50
+        if prec_amount is not None and 1 <= int(prec_amount) <= 4:
+            percent = _PRECIP_CHANCE[int(prec_amount)]
         precip_desc = f"{prec_type.title()} (~{percent}% chance)"
     return {
         "seeing_quality": seeing_desc,
@@ -159,81 +421,43 @@ def describe_weather(code: Any, cloud_cover: Any) -> str:
                 return "Partly cloudy"
             return "Overcast"
         return "Fair"
-    conditions = {
-        0: "Clear sky",
-        1: "Mainly clear",
-        2: "Partly cloudy",
-        3: "Overcast",
-        45: "Fog",
-        48: "Depositing rime fog",
-        51: "Light drizzle",
-        53: "Drizzle",
-        55: "Dense drizzle",
-        56: "Freezing drizzle",
-        57: "Dense freezing drizzle",
-        61: "Slight rain",
-        63: "Rain",
-        65: "Heavy rain",
-        66: "Freezing rain",
-        67: "Heavy freezing rain",
-        71: "Slight snow",
-        73: "Snow",
-        75: "Heavy snow",
-        77: "Snow grains",
-        80: "Rain showers",
-        81: "Rain showers",
-        82: "Violent rain showers",
-        85: "Snow showers",
-        86: "Heavy snow showers",
-        95: "Thunderstorm",
-        96: "Thunderstorm with hail",
-        99: "Heavy hailstorm",
-    }
-    return conditions.get(code, "Fair")
+    return _CONDITIONS.get(code, "Fair")
 
 
 def estimate_moon_phase(target: datetime) -> float:
-    base = datetime(2000, 1, 6, 18, 14)  # known new moon
-    synodic_days = 29.53058867
-    diff_days = (target - base).total_seconds() / 86400.0
-    return (diff_days % synodic_days) / synodic_days
+    diff_days = (target - _NEW_MOON_BASE).total_seconds() / 86400.0
+    return (diff_days % _SYNODIC_DAYS) / _SYNODIC_DAYS
+
+
+def estimate_moon_phase_batch(targets: list[datetime]) -> list[float]:
+    """Phase fractions for a whole timeline, e.g. an hourly forecast range.
+
+    One comprehension with the base and period bound locally beats calling
+    estimate_moon_phase per sample when plotting illumination over days.
+    """
+    base = _NEW_MOON_BASE
+    synodic = _SYNODIC_DAYS
+    return [
+        ((target - base).total_seconds() / 86400.0 % synodic) / synodic
+        for target in targets
+    ]
 
 
 def describe_moon_phase(value: float | None) -> tuple[str | None, float | None]:
     if value is None:
         return None, None
     phase = max(0.0, min(1.0, float(value)))
-    illumination = (1 - math.cos(2 * math.pi * phase)) / 2 * 100
-    if phase < 0.0625 or phase >= 0.9375:
-        label = "New Moon"
-    elif phase < 0.1875:
-        label = "Waxing Crescent"
-    elif phase < 0.3125:
-        label = "First Quarter"
-    elif phase < 0.4375:
-        label = "Waxing Gibbous"
-    elif phase < 0.5625:
-        label = "Full Moon"
-    elif phase < 0.6875:
-        label = "Waning Gibbous"
-    elif phase < 0.8125:
-        label = "Last Quarter"
+    idx = phase * 1024
+    lo = int(idx)
+    if lo >= 1024:
+        illumination = _ILLUM_LUT[1024]
     else:
-        label = "Waning Crescent"
+        frac = idx - lo
+        illumination = _ILLUM_LUT[lo] + frac * (_ILLUM_LUT[lo + 1] - _ILLUM_LUT[lo])
+    label = _PHASE_LABELS[bisect.bisect_right(_PHASE_BOUNDS, phase)]
     return label, illumination
 
 
 def build_7timer_graph_url() -> str:
     """Helper for the dashboard to embed the latest astro chart."""
-    params = {
-        "lon": AMBIENT_LON,
-        "lat": AMBIENT_LAT,
-        "ac": 0,
-        "lang": "en",
-        "unit": 0,
-        "output": "internal",
-        "tzshift": 0,
-        "cache": int(time.time()),
-    }
-    query = "&".join(f"{key}={value}" for key, value in params.items())
-    return f"{SEVENTIMER_GRAPH_URL}?{query}"
+    return _GRAPH_PREFIX + str(int(time.time()))